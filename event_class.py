@@ -1,6 +1,8 @@
 from typing import List, Optional
 
 class Event:
+    __slots__ = ('name', 'duration', 'dependencies', 'resources_required', 'priority', 'deadline')
+
     def __init__(
         self,
         name: str,
@@ -4,12 +4,20 @@ Handles topological sorting, resource allocation, deadlines, and dynamic task mo
 """
 
 from typing import List, Dict, Tuple, Optional
-from collections import deque, defaultdict
+import sys
 import heapq
 from event_class import Event
 
 
 class EventScheduler:
+    """
+    Schedules events under dependency and resource constraints
+    
+    Change events through add_event, modify_event, remove_event and clear_events.
+    The cached topological order and cycle checks on mutation only see changes made
+    through these methods; schedule_events always rebuilds and validates the graph,
+    so direct edits to Event attributes are picked up there
+    """
     def __init__(self, total_resources: int):
         """
         Initialize the Event Scheduler
@@ -20,15 +28,53 @@ class EventScheduler:
         self.total_resources = total_resources
         self.events: Dict[str, Event] = {}
         self.schedule: Dict[str, Tuple[int, int]] = {}  # event_name -> (start_time, end_time)
+        self._topo_cache: Optional[List[str]] = None  # last topological order
+        self._graph_dirty = True  # set whenever the dependency graph or priorities change
+        # Dependency graph in CSR form over event ids ordered by (priority, name);
+        # dependencies of id i are _csr_indices[_csr_indptr[i]:_csr_indptr[i + 1]]
+        # and its dependents are the same slice of the _csr_rev_* arrays
+        self._csr_order: List[str] = []  # event id -> event name
+        self._csr_indptr: List[int] = [0]
+        self._csr_indices: List[int] = []
+        self._csr_rev_indptr: List[int] = [0]
+        self._csr_rev_indices: List[int] = []
+        # event_name -> ((start, end, resources_required, deadline), formatted schedule line)
+        self._line_cache: Dict[str, Tuple[Tuple[int, int, int, int], str]] = {}
+        self._references: Dict[str, int] = {}  # event_name -> number of dependency entries naming it
         
     def add_event(self, event: Event) -> None:
-        """Add an event to the scheduler"""
+        """Add an event to the scheduler, rejecting it if a dependency cycle is reachable from it"""
+        previous = self.events.get(event.name)
         self.events[event.name] = event
+        # An event nothing depends on cannot close a cycle, so only walk its
+        # dependencies when some event (possibly itself) refers to its name
+        referenced = self._references.get(event.name) or event.name in event.dependencies
+        if referenced and self._has_cycle_from(event.name):
+            if previous is None:
+                del self.events[event.name]
+            else:
+                self.events[event.name] = previous
+            raise ValueError(f"Event '{event.name}' not added: a dependency cycle is reachable from it")
+        if previous is not None:
+            self._count_references(previous.dependencies, -1)
+        self._count_references(event.dependencies, 1)
+        self._graph_dirty = True
+        
+    def clear_events(self) -> None:
+        """Remove all events and the current schedule"""
+        self.events = {}
+        self.schedule = {}
+        self._graph_dirty = True
+        self._line_cache = {}
+        self._references = {}
         
     def remove_event(self, event_name: str) -> bool:
         """Remove an event from the scheduler"""
         if event_name in self.events:
+            self._count_references(self.events[event_name].dependencies, -1)
             del self.events[event_name]
+            self._graph_dirty = True
+            self._line_cache.pop(event_name, None)
             if event_name in self.schedule:
                 del self.schedule[event_name]
             return True
@@ -41,74 +87,149 @@ class EventScheduler:
         Args:
             event_name: Name of the event to modify
             **kwargs: Properties to update (duration, dependencies, resources_required, priority, deadline)
+        
+        Raises ValueError without changing anything if a cycle is reachable through the new dependencies
         """
         if event_name not in self.events:
             return False
             
         event = self.events[event_name]
-        if 'duration' in kwargs:
-            event.duration = kwargs['duration']
         if 'dependencies' in kwargs:
+            previous = event.dependencies
             event.dependencies = kwargs['dependencies']
+            if self._has_cycle_from(event_name):
+                event.dependencies = previous
+                raise ValueError(f"Event '{event_name}' not modified: a dependency cycle is reachable from it")
+            self._count_references(previous, -1)
+            self._count_references(event.dependencies, 1)
+            self._graph_dirty = True
+        if 'duration' in kwargs:
+            event.duration = kwargs['duration']
         if 'resources_required' in kwargs:
             event.resources_required = kwargs['resources_required']
         if 'priority' in kwargs:
             event.priority = kwargs['priority']
+            self._graph_dirty = True  # priority is the ordering tiebreaker
         if 'deadline' in kwargs:
             event.deadline = kwargs['deadline']
         return True
     
-    def topological_sort(self) -> List[str]:
+    def _count_references(self, dependencies: List[str], delta: int) -> None:
+        """Adjust how many dependency entries refer to each of these event names"""
+        references = self._references
+        for dependency in dependencies:
+            count = references.get(dependency, 0) + delta
+            if count:
+                references[dependency] = count
+            else:
+                del references[dependency]
+    
+    def _has_cycle_from(self, node: str) -> bool:
         """
-        Perform topological sort using Kahn's algorithm with priority and name as tiebreakers
-        Returns sorted list of event names
+        Check for a dependency cycle reachable from node
+        Iterative DFS that stops at the first back edge instead of running a full topological sort
+        """
+        visiting = {node}  # events on the current DFS path
+        done = set()
+        stack = [(node, iter(self.events[node].dependencies))]
+        while stack:
+            current, dependencies = stack[-1]
+            for dependency in dependencies:
+                if dependency in visiting:
+                    return True
+                if dependency in done or dependency not in self.events:
+                    continue
+                visiting.add(dependency)
+                stack.append((dependency, iter(self.events[dependency].dependencies)))
+                break
+            else:
+                stack.pop()
+                visiting.discard(current)
+                done.add(current)
+        return False
+    
+    def _ensure_graph(self) -> None:
         """
-        in_degree = defaultdict(int)
-        adj_list = defaultdict(list)
+        Rebuild the CSR dependency graph if the events changed since the last build
+        Raises ValueError if an event depends on an unknown event
+        """
+        if not self._graph_dirty:
+            return
 
-        for event_name in self.events:
-            in_degree[event_name] = 0
+        events = self.events
+        order = sorted(events, key=lambda name: (events[name].priority, name))
+        ids = {name: i for i, name in enumerate(order)}
+        n_events = len(order)
 
-        for event_name, event in self.events.items():
-            for dependency in event.dependencies:
-                if dependency not in self.events:
+        # Forward adjacency: event -> its dependencies
+        indptr = [0]
+        indices = []
+        dependent_counts = [0] * n_events
+        for event_name in order:
+            for dependency in events[event_name].dependencies:
+                dependency_id = ids.get(dependency)
+                if dependency_id is None:
                     raise ValueError(f"Event '{event_name}' depends on unknown event '{dependency}'")
-                adj_list[dependency].append(event_name)
-                in_degree[event_name] += 1
+                indices.append(dependency_id)
+                dependent_counts[dependency_id] += 1
+            indptr.append(len(indices))
 
-        # Use (priority, name) for stable ordering
-        ready_nodes = [(self.events[name].priority, name) for name in self.events if in_degree[name] == 0]
-        ready_nodes.sort()  # sort by (priority, name)
-        ready_heap = []
-        for item in ready_nodes:
-            heapq.heappush(ready_heap, item)
+        # Reverse adjacency: event -> events that depend on it
+        rev_indptr = [0] * (n_events + 1)
+        for i in range(n_events):
+            rev_indptr[i + 1] = rev_indptr[i] + dependent_counts[i]
+        rev_indices = [0] * len(indices)
+        next_slot = rev_indptr[:-1]
+        for i in range(n_events):
+            for k in range(indptr[i], indptr[i + 1]):
+                dependency_id = indices[k]
+                rev_indices[next_slot[dependency_id]] = i
+                next_slot[dependency_id] += 1
 
-        sorted_order = []
+        self._csr_order = order
+        self._csr_indptr = indptr
+        self._csr_indices = indices
+        self._csr_rev_indptr = rev_indptr
+        self._csr_rev_indices = rev_indices
+        self._topo_cache = None
+        self._graph_dirty = False
+    
+    def topological_sort(self) -> List[str]:
+        """
+        Perform topological sort using Kahn's algorithm with priority and name as tiebreakers
+        Returns sorted list of event names (cached until the events change through
+        the scheduler's methods or schedule_events runs)
+        """
+        self._ensure_graph()
+        if self._topo_cache is not None:
+            return list(self._topo_cache)
+
+        order = self._csr_order
+        indptr = self._csr_indptr
+        rev_indptr = self._csr_rev_indptr
+        rev_indices = self._csr_rev_indices
+        in_degree = [indptr[i + 1] - indptr[i] for i in range(len(order))]
 
+        # Min-heap of event ids, which are numbered in (priority, name) order;
+        # ids listed in increasing order are already a valid heap
+        ready_heap = [i for i, degree in enumerate(in_degree) if degree == 0]
+
+        sorted_order = []
 
         while ready_heap:
-            # Gather all nodes currently available (all with in-degree 0)
-            current_level = []
-            while ready_heap:
-                _, current = heapq.heappop(ready_heap)
-                current_level.append(current)
-            # Sort current_level by (priority, name) for stability
-            current_level = sorted(current_level, key=lambda n: (self.events[n].priority, n))
-            newly_ready = []
-            for current in current_level:
-                sorted_order.append(current)
-                for neighbor in adj_list[current]:
-                    in_degree[neighbor] -= 1
-                    if in_degree[neighbor] == 0:
-                        newly_ready.append(neighbor)
-            # Add all newly ready nodes to heap, sorted by (priority, name)
-            for neighbor in sorted(newly_ready, key=lambda n: (self.events[n].priority, n)):
-                heapq.heappush(ready_heap, (self.events[neighbor].priority, neighbor))
-
-        if len(sorted_order) != len(self.events):
+            current = heapq.heappop(ready_heap)
+            sorted_order.append(order[current])
+            for k in range(rev_indptr[current], rev_indptr[current + 1]):
+                neighbor = rev_indices[k]
+                in_degree[neighbor] -= 1
+                if in_degree[neighbor] == 0:
+                    heapq.heappush(ready_heap, neighbor)
+
+        if len(sorted_order) != len(order):
             raise ValueError("Cycle detected in task dependencies!")
 
-        return sorted_order
+        self._topo_cache = sorted_order
+        return list(sorted_order)
     
     def schedule_events(self) -> Dict[str, Tuple[int, int]]:
         """
@@ -118,73 +239,117 @@ class EventScheduler:
         # Clear previous schedule
         self.schedule = {}
         
-        # Get topological order
-        sorted_events = self.topological_sort()
+        # Local bindings for the hot loop
+        events = self.events
+        schedule = self.schedule
+        total_resources = self.total_resources
+        heappush = heapq.heappush
+        heappop = heapq.heappop
         
-        # Resource allocation using event-based simulation
-        scheduled = set()
+        # Validate dependencies (unknown events, cycles); this also builds the
+        # CSR graph, whose ids are numbered by (priority, name) so the heaps
+        # compare plain ints. Always rebuild so direct edits to events are seen
+        self._graph_dirty = True
+        self.topological_sort()
+        order_key = self._csr_order
+        indptr = self._csr_indptr
+        rev_indptr = self._csr_rev_indptr
+        rev_indices = self._csr_rev_indices
         
-        # Priority queue: (priority, event_name)
-        ready_queue = []
+        events_by_id = [events[name] for name in order_key]
+        resources_by_id = [event.resources_required for event in events_by_id]
+        duration_by_id = [event.duration for event in events_by_id]
+        n_events = len(order_key)
         
-        # Track events waiting for dependencies
-        waiting = {}
-        for event_name in sorted_events:
-            event = self.events[event_name]
-            if not event.dependencies:
-                heapq.heappush(ready_queue, (event.priority, event_name))
-            else:
-                waiting[event_name] = set(event.dependencies)
+        # Track how many unfinished dependencies each event has
+        remaining = [indptr[i + 1] - indptr[i] for i in range(n_events)]
+        waiting_count = sum(1 for count in remaining if count)
+        
+        # Latest end time among each event's completed dependencies
+        earliest_start = [0] * n_events
+        
+        # No ready event can start once free resources drop below this
+        min_required = min(resources_by_id, default=0)
         
-        current_time = 0
         active_resources = 0
-        active_events = []  # List of (end_time, event_name, resources_used)
+        active_events = []  # Heap of (end_time, event_id)
+        
+        # Fast path: events without dependencies are all ready at time 0 and are
+        # considered in id order, so place the ones that fit directly. The rest
+        # form the priority queue of event ids; ids listed in increasing order
+        # are already a valid heap
+        ready_queue = []
+        for event_id in range(n_events):
+            if remaining[event_id]:
+                continue
+            resources_required = resources_by_id[event_id]
+            if active_resources + resources_required <= total_resources:
+                duration = duration_by_id[event_id]
+                schedule[order_key[event_id]] = (0, duration)
+                active_resources += resources_required
+                heappush(active_events, (duration, event_id))
+            else:
+                ready_queue.append(event_id)
+        
+        current_time = active_events[0][0] if active_events else 0
         
-        while ready_queue or active_events or waiting:
-            # Complete events finishing at current time
+        while ready_queue or active_events or waiting_count:
+            # Complete all events finishing at current time in one batch
+            just_finished = []
             while active_events and active_events[0][0] == current_time:
-                _, completed_name, resources_used = heapq.heappop(active_events)
-                active_resources -= resources_used
-                scheduled.add(completed_name)
-                
-                # Check if any waiting events can now be ready
-                for event_name in list(waiting.keys()):
-                    if completed_name in waiting[event_name]:
-                        waiting[event_name].remove(completed_name)
-                        if len(waiting[event_name]) == 0:
-                            event = self.events[event_name]
-                            heapq.heappush(ready_queue, (event.priority, event_name))
-                            del waiting[event_name]
+                completed_id = heappop(active_events)[1]
+                active_resources -= resources_by_id[completed_id]
+                just_finished.append(completed_id)
+            
+            # Check if any dependents of the completed events are now ready
+            for completed_id in just_finished:
+                for k in range(rev_indptr[completed_id], rev_indptr[completed_id + 1]):
+                    event_id = rev_indices[k]
+                    if earliest_start[event_id] < current_time:
+                        earliest_start[event_id] = current_time
+                    # Duplicate dependency entries appear in both counts, so they cancel out
+                    remaining[event_id] -= 1
+                    if not remaining[event_id]:
+                        heappush(ready_queue, event_id)
+                        waiting_count -= 1
             
-            # Try to schedule ready events that have sufficient resources
-            temp_queue = []
+            # Without a completion nothing new can become feasible, and with
+            # nothing active no completion is coming either
+            if not just_finished:
+                break
+            
+            # Try to schedule ready events that have sufficient resources,
+            # stopping as soon as nothing else could fit
+            deferred = []
             scheduled_this_round = False
             
-            while ready_queue:
-                priority, event_name = heapq.heappop(ready_queue)
-                event = self.events[event_name]
+            while ready_queue and total_resources - active_resources >= min_required:
+                event_id = heappop(ready_queue)
+                resources_required = resources_by_id[event_id]
                 
                 # Check resource availability
-                if active_resources + event.resources_required <= self.total_resources:
+                if active_resources + resources_required <= total_resources:
                     # Calculate start time (max of current time and all dependency end times)
-                    start_time = current_time
-                    if event.dependencies:
-                        dep_end_times = [self.schedule[dep][1] for dep in event.dependencies]
-                        start_time = max(start_time, max(dep_end_times))
+                    start_time = max(current_time, earliest_start[event_id])
                     
-                    end_time = start_time + event.duration
-                    self.schedule[event_name] = (start_time, end_time)
+                    end_time = start_time + duration_by_id[event_id]
+                    schedule[order_key[event_id]] = (start_time, end_time)
                     
-                    active_resources += event.resources_required
-                    heapq.heappush(active_events, (end_time, event_name, event.resources_required))
+                    active_resources += resources_required
+                    heappush(active_events, (end_time, event_id))
                     scheduled_this_round = True
                 else:
                     # Not enough resources, defer
-                    temp_queue.append((priority, event_name))
+                    deferred.append(event_id)
             
-            # Restore deferred events
-            for item in temp_queue:
-                heapq.heappush(ready_queue, item)
+            # Restore deferred events; events never popped stay in place.
+            # Deferred events were popped in order, so if the sweep drained the
+            # queue they already form a valid heap
+            if not ready_queue:
+                ready_queue = deferred
+            else:
+                for event_id in deferred:
+                    heappush(ready_queue, event_id)
             
             # Advance time to next event completion or wait
             if active_events:
@@ -194,7 +359,7 @@ class EventScheduler:
                 # This shouldn't happen with proper resource management
                 break
         
-        return self.schedule
+        return schedule
     
     def check_deadlines(self) -> List[Tuple[str, int, int]]:
         """
@@ -202,44 +367,54 @@ class EventScheduler:
         Returns list of (event_name, deadline, actual_completion_time)
         """
         missed = []
+        events = self.events
         for event_name, (start, end) in self.schedule.items():
-            event = self.events[event_name]
-            if event.deadline > 0 and end > event.deadline:
-                missed.append((event_name, event.deadline, end))
+            deadline = events[event_name].deadline
+            if deadline > 0 and end > deadline:
+                missed.append((event_name, deadline, end))
         return missed
     
     def get_total_completion_time(self) -> int:
         """Get the total project completion time"""
-        if not self.schedule:
-            return 0
-        return max(end for start, end in self.schedule.values())
+        return max((end for _, end in self.schedule.values()), default=0)
     
     def print_schedule(self) -> None:
         """Print the complete schedule with details"""
         sorted_order = self.topological_sort()
-        print(f"\nSorted Task Execution Order (Topological Sort): {sorted_order}")
-        print("\nTask Schedule:")
+        lines = [f"\nSorted Task Execution Order (Topological Sort): {sorted_order}", "\nTask Schedule:"]
         
+        line_cache = self._line_cache
         for event_name in sorted_order:
             if event_name in self.schedule:
                 start, end = self.schedule[event_name]
                 event = self.events[event_name]
-                deadline_info = f", Deadline: {event.deadline}" if event.deadline > 0 else ""
-                print(f"Task {event_name}: Start at {start}, End at {end} "
-                      f"(Workers: {event.resources_required}{deadline_info})")
+                # Reuse the formatted line only if every field it shows is unchanged
+                key = (start, end, event.resources_required, event.deadline)
+                cached = line_cache.get(event_name)
+                if cached is not None and cached[0] == key:
+                    line = cached[1]
+                else:
+                    deadline_info = f", Deadline: {event.deadline}" if event.deadline > 0 else ""
+                    line = (f"Task {event_name}: Start at {start}, End at {end} "
+                            f"(Workers: {event.resources_required}{deadline_info})")
+                    line_cache[event_name] = (key, line)
+                lines.append(line)
         
         total_time = self.get_total_completion_time()
-        print(f"\nTotal Project Completion Time: {total_time}")
+        lines.append(f"\nTotal Project Completion Time: {total_time}")
         
         # Check deadlines
         missed = self.check_deadlines()
         if missed:
-            print("\nDEADLINE VIOLATIONS:")
+            lines.append("\nDEADLINE VIOLATIONS:")
             for event_name, deadline, actual_end in missed:
-                print(f"Task {event_name}: Deadline was {deadline}, finished at {actual_end} "
-                      f"(Missed by {actual_end - deadline} days)")
+                lines.append(f"Task {event_name}: Deadline was {deadline}, finished at {actual_end} "
+                             f"(Missed by {actual_end - deadline} days)")
         else:
-            print("\nAll deadlines met.")
+            lines.append("\nAll deadlines met.")
+        
+        # Emit everything in a single write
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 
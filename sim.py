@@ -4,6 +4,10 @@ Allows user to input tasks dynamically and manage the schedule
 """
 
 import json
+try:
+    import orjson  # optional, faster JSON encoding/decoding
+except ImportError:
+    orjson = None
 from event_class import Event
 from event_scheduler import EventScheduler
 
@@ -78,7 +82,11 @@ def add_task_interactive(scheduler):
         deadline=deadline
     )
     
-    scheduler.add_event(event)
+    try:
+        scheduler.add_event(event)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
     print(f"Task '{name}' added.")
 
 
@@ -161,7 +169,11 @@ def modify_task_interactive(scheduler):
         updates['deadline'] = int(deadline_input)
     
     if updates:
-        scheduler.modify_event(name, **updates)
+        try:
+            scheduler.modify_event(name, **updates)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
         print(f"Task '{name}' modified.")
     else:
         print("No changes made.")
@@ -210,27 +222,44 @@ def check_deadlines(scheduler):
 def load_tasks_from_json(scheduler, filename):
     """Load tasks from a JSON file"""
     try:
-        with open(filename, 'r') as f:
-            data = json.load(f)
+        with open(filename, 'rb') as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson else json.loads(raw)
+        
+        # Build every task before touching the scheduler
+        new_events = [
+            Event(
+                task_data['name'],
+                task_data['duration'],
+                task_data.get('dependencies') or [],
+                task_data.get('resources_required', 1),
+                task_data.get('priority', 1),
+                task_data.get('deadline', -1)
+            )
+            for task_data in data['tasks']
+        ]
+        
+        # Keep the current tasks so a failed load can be rolled back
+        previous_events = list(scheduler.events.values())
+        previous_schedule = dict(scheduler.schedule)
         
         # Clear existing tasks if requested
         if scheduler.events:
             response = input("Clear existing tasks? (y/n): ").strip().lower()
             if response == 'y':
-                scheduler.events = {}
-                scheduler.schedule = {}
+                scheduler.clear_events()
         
         # Load tasks
-        for task_data in data['tasks']:
-            event = Event(
-                name=task_data['name'],
-                duration=task_data['duration'],
-                dependencies=task_data.get('dependencies', []),
-                resources_required=task_data.get('resources_required', 1),
-                priority=task_data.get('priority', 1),
-                deadline=task_data.get('deadline', -1)
-            )
-            scheduler.add_event(event)
+        try:
+            add_event = scheduler.add_event
+            for event in new_events:
+                add_event(event)
+        except ValueError:
+            scheduler.clear_events()
+            for event in previous_events:
+                scheduler.add_event(event)
+            scheduler.schedule = previous_schedule
+            raise
         
         # Update total resources if specified
         if 'total_resources' in data:
@@ -266,8 +295,14 @@ def save_tasks_to_json(scheduler, filename):
             'tasks': tasks_data
         }
         
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2)
+        # orjson writes non-ASCII names as raw UTF-8 where json escapes them
+        # (\u00e9); both files load the same either way
+        if orjson:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w') as f:
+                json.dump(data, f, indent=2)
         
         print(f"Saved {len(tasks_data)} tasks to '{filename}'")
         